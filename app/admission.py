@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+"""Control de admisión para operaciones pesadas de la app.
+
+Al inicio de un examen muchos estudiantes presionan "Iniciar" casi a la vez.
+Este módulo limita cuántas operaciones pesadas (sorteo del cuestionario,
+cálculo del puntaje) se ejecutan en paralelo y mantiene una fila FIFO para
+el resto. La API es no bloqueante: cada sesión consulta su turno en cada
+re-ejecución del script y, mientras espera, la UI muestra su posición.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List
+
+# Valor de `try_acquire` para un ticket descartado por no consultar a tiempo
+EXPIRED = -1
+
+# El intervalo de consulta de quien está lejos en la fila crece hasta 4x la base
+MAX_POLL_BACKOFF = 4
+
+
+def poll_interval(position: int, max_concurrent: int, base: float) -> float:
+    """Segundos hasta la próxima consulta de un ticket en `position`.
+
+    Un cupo liberado queda ocioso hasta que consulta alguien de adelante, así
+    que las dos primeras tandas (`2 * max_concurrent`) consultan a 1/4 de la
+    base y las dos siguientes a 1/2. El resto retrocede una base por cada
+    cuatro tandas por delante, hasta `MAX_POLL_BACKOFF` veces la base. La UI
+    recalcula el intervalo en cada consulta.
+    """
+    if position <= 2 * max_concurrent:
+        return base / 4
+    if position <= 4 * max_concurrent:
+        return base / 2
+    batches_ahead = (position - 1) // (4 * max_concurrent)
+    return base * min(batches_ahead, MAX_POLL_BACKOFF)
+
+
+def default_ticket_ttl(base: float) -> float:
+    """TTL holgado frente al intervalo máximo y a pestañas en segundo plano."""
+    return max(30.0, base * MAX_POLL_BACKOFF * 3)
+
+
+@dataclass
+class _Ticket:
+    """Estado interno de una sesión en la fila de espera."""
+
+    enqueued_at: float
+    last_seen: float
+
+
+class AdmissionController:
+    """Limita operaciones pesadas concurrentes con una fila FIFO de espera.
+
+    - max_concurrent: cupos disponibles para operaciones simultáneas.
+    - ticket_ttl: segundos sin consultar tras los cuales un ticket en espera
+      se descarta (p. ej. el estudiante cerró la pestaña). Su siguiente
+      consulta recibe `EXPIRED` en lugar de volver a encolarse al final.
+    - max_hold: segundos tras los cuales un cupo no liberado se recupera, para
+      que un error entre `try_acquire` y `release` no reduzca la capacidad.
+    - clock: fuente de tiempo monotónica; inyectable para simulaciones.
+
+    Es seguro usar una única instancia compartida entre hilos (Streamlit
+    ejecuta cada sesión en su propio hilo).
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        ticket_ttl: float = 15.0,
+        max_hold: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent debe ser al menos 1")
+        self.max_concurrent = max_concurrent
+        self.ticket_ttl = ticket_ttl
+        self.max_hold = max_hold
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._waiting: OrderedDict[str, _Ticket] = OrderedDict()
+        self._active: Dict[str, float] = {}
+        self._expired_tickets: OrderedDict[str, None] = OrderedDict()
+        self._wait_times: Deque[float] = deque(maxlen=2000)
+        self._last_report = -math.inf
+        self._admitted = 0
+        self._expired = 0
+        self._reclaimed = 0
+        self._peak_active = 0
+        self._peak_waiting = 0
+
+    def try_acquire(self, ticket: str) -> int:
+        """Intenta obtener un cupo para `ticket` sin bloquear.
+
+        Retorna 0 si el ticket fue admitido (y debe liberarse con `release`),
+        su posición en la fila (1 = siguiente en pasar) si debe esperar, o
+        `EXPIRED` (una sola vez) si fue descartado por no consultar a tiempo.
+        """
+        with self._lock:
+            now = self._clock()
+            self._expire_stale(now)
+            if ticket in self._active:
+                return 0
+            if ticket in self._expired_tickets:
+                del self._expired_tickets[ticket]
+                return EXPIRED
+
+            entry = self._waiting.get(ticket)
+            if entry is None:
+                entry = _Ticket(enqueued_at=now, last_seen=now)
+                self._waiting[ticket] = entry
+                self._peak_waiting = max(self._peak_waiting, len(self._waiting))
+            else:
+                entry.last_seen = now
+
+            position = self._position(ticket)
+            free_slots = self.max_concurrent - len(self._active)
+            if position > free_slots:
+                return position
+
+            del self._waiting[ticket]
+            self._active[ticket] = now
+            self._admitted += 1
+            self._peak_active = max(self._peak_active, len(self._active))
+            self._wait_times.append(now - entry.enqueued_at)
+            return 0
+
+    def release(self, ticket: str) -> None:
+        """Libera el cupo de `ticket`; no falla si no estaba admitido."""
+        with self._lock:
+            self._active.pop(ticket, None)
+
+    def cancel(self, ticket: str) -> None:
+        """Retira `ticket` de la fila de espera si estaba encolado."""
+        with self._lock:
+            self._waiting.pop(ticket, None)
+            self._expired_tickets.pop(ticket, None)
+
+    def report_due(self, interval: float) -> bool:
+        """Indica si pasaron `interval` segundos desde el último reporte.
+
+        Solo una de las sesiones concurrentes recibe True por intervalo, para
+        registrar métricas del proceso sin duplicarlas.
+        """
+        with self._lock:
+            now = self._clock()
+            if now - self._last_report < interval:
+                return False
+            self._last_report = now
+            return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Retorna métricas de carga actuales.
+
+        Llaves: "active", "waiting", "max_concurrent", "admitted", "expired",
+        "reclaimed", "peak_active", "peak_waiting", "wait_p50" y "wait_p99"
+        (segundos de espera en fila de los últimos tickets admitidos).
+        """
+        with self._lock:
+            waits = sorted(self._wait_times)
+            return {
+                "active": len(self._active),
+                "waiting": len(self._waiting),
+                "max_concurrent": self.max_concurrent,
+                "admitted": self._admitted,
+                "expired": self._expired,
+                "reclaimed": self._reclaimed,
+                "peak_active": self._peak_active,
+                "peak_waiting": self._peak_waiting,
+                "wait_p50": _percentile(waits, 50),
+                "wait_p99": _percentile(waits, 99),
+            }
+
+    def _position(self, ticket: str) -> int:
+        for idx, key in enumerate(self._waiting):
+            if key == ticket:
+                return idx + 1
+        return 0
+
+    def _expire_stale(self, now: float) -> None:
+        stale = [
+            key
+            for key, entry in self._waiting.items()
+            if now - entry.last_seen > self.ticket_ttl
+        ]
+        for key in stale:
+            del self._waiting[key]
+            self._expired_tickets[key] = None
+        self._expired += len(stale)
+        while len(self._expired_tickets) > 2000:
+            self._expired_tickets.popitem(last=False)
+
+        held = [
+            key
+            for key, admitted_at in self._active.items()
+            if now - admitted_at > self.max_hold
+        ]
+        for key in held:
+            del self._active[key]
+        self._reclaimed += len(held)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentil por rango más cercano; 0.0 si no hay datos."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import streamlit as st
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
 from pathlib import Path
+import logging
+import math
+import os
 import sys
+import uuid
 
 # Asegurar que el paquete raíz esté en sys.path cuando Streamlit ejecuta por archivo
 _ROOT = Path(__file__).resolve().parents[1]
@@ -12,12 +16,54 @@ if str(_ROOT) not in sys.path:
 
 from app.utils import load_questions, get_topics, get_questions_for_topic, get_exam_questions, format_correct_answer_display
 from app.logic import compute_score
+from app.admission import EXPIRED, AdmissionController, default_ticket_ttl, poll_interval
 
 
 APP_TITLE = "Práctica Interactiva: Matemáticas Discretas"
 QUESTIONS_PATH = "data/questions.json"
 DEFAULT_QUESTIONS_COUNT = 4  # Número de preguntas por defecto
 
+# Logger propio con handler: Streamlit solo configura el suyo y re-ejecuta este
+# script en cada interacción, por eso se agrega una única vez.
+logger = logging.getLogger("discrete_app")
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+# Avisos de configuración inválida; se muestran en la app en lugar de fallar
+CONFIG_WARNINGS: List[str] = []
+
+
+def _env_number(name: str, default: float, cast: Callable[[str], float]) -> Any:
+    """Lee un número positivo del entorno; usa `default` si falta o es inválido."""
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = cast(raw)
+    except ValueError:
+        value = None
+    if value is None or not (0 < value < math.inf):
+        CONFIG_WARNINGS.append(f"Valor inválido para {name}: '{raw}'. Se usa {default}.")
+        return default
+    return value
+
+
+# Control de admisión: cupos para ejecuciones pesadas simultáneas (inicio y
+# cierre del cuestionario) y frecuencia base de consulta de una sesión en espera.
+ADMISSION_MAX_CONCURRENT: int = _env_number("DISCRETE_APP_MAX_CONCURRENT", 8, int)
+ADMISSION_POLL_SECONDS: float = _env_number("DISCRETE_APP_POLL_SECONDS", 1.0, float)
+# Métricas de carga: cada cuánto se registran en el log y si se muestran en la barra lateral
+ADMISSION_LOG_SECONDS: float = _env_number("DISCRETE_APP_LOAD_LOG_SECONDS", 30.0, float)
+SHOW_LOAD_METRICS = os.environ.get("DISCRETE_APP_SHOW_LOAD", "") == "1"
+
+WAITING_MESSAGES: Dict[str, str] = {
+    "start": "Hay muchos estudiantes iniciando a la vez.",
+    "finish": "Hay muchos estudiantes finalizando a la vez; tu puntaje se calculará en breve.",
+}
+
 # Paleta básica para consistencia visual
 PALETTE: Dict[str, str] = {
     "primary": "#2563EB",  # azul
@@ -28,6 +74,21 @@ PALETTE: Dict[str, str] = {
 }
 
 
+@st.cache_resource
+def get_admission_controller() -> AdmissionController:
+    """Controlador único del proceso, compartido por todas las sesiones."""
+    return AdmissionController(
+        max_concurrent=ADMISSION_MAX_CONCURRENT,
+        ticket_ttl=default_ticket_ttl(ADMISSION_POLL_SECONDS),
+    )
+
+
+@st.cache_data(show_spinner=False)
+def load_bank(json_path: str) -> Dict[str, Any]:
+    """Lee el banco de preguntas una sola vez por proceso."""
+    return load_questions(json_path)
+
+
 def init_state() -> None:
     """Inicializa claves en session_state si no existen."""
     if "topic" not in st.session_state:
@@ -46,6 +107,18 @@ def init_state() -> None:
         st.session_state.mode = "practice"  # "practice" o "exam"
     if "questions_count" not in st.session_state:
         st.session_state.questions_count = DEFAULT_QUESTIONS_COUNT
+    if "questions" not in st.session_state:
+        st.session_state.questions = None  # preguntas sorteadas al iniciar
+    if "result" not in st.session_state:
+        st.session_state.result = None  # puntaje calculado al finalizar
+    if "pending_op" not in st.session_state:
+        st.session_state.pending_op = None  # ("start", tema) o ("finish", None)
+    if "ticket" not in st.session_state:
+        st.session_state.ticket = uuid.uuid4().hex
+    if "poll_every" not in st.session_state:
+        st.session_state.poll_every = None  # intervalo del fragmento de espera
+    if "admission_notice" not in st.session_state:
+        st.session_state.admission_notice = None
 
 
 def reset_quiz() -> None:
@@ -53,6 +126,101 @@ def reset_quiz() -> None:
     st.session_state.current_idx = 0
     st.session_state.responses = []
     st.session_state.finished = False
+    st.session_state.result = None
+
+
+def draw_questions(topic: str) -> List[Dict[str, Any]]:
+    """Sortea las preguntas del cuestionario según el tema o modo examen."""
+    if topic == "Examen":
+        return get_exam_questions(st.session_state.data)
+    return get_questions_for_topic(
+        st.session_state.data,
+        topic,
+        max_questions=st.session_state.questions_count,
+        shuffle=True
+    )
+
+
+def request_op(op: str, topic: str | None = None) -> None:
+    """Encola una operación pesada y re-ejecuta para pedir cupo de inmediato."""
+    st.session_state.pending_op = (op, topic)
+    st.rerun()
+
+
+def cancel_pending_op() -> None:
+    """Abandona la operación en espera y libera el lugar en la fila."""
+    controller = get_admission_controller()
+    controller.cancel(st.session_state.ticket)
+    controller.release(st.session_state.ticket)
+    st.session_state.pending_op = None
+
+
+def expire_pending_op() -> None:
+    """El ticket se descartó por inactividad: se abandona la operación y se avisa."""
+    st.session_state.pending_op = None
+    st.session_state.admission_notice = (
+        "Tu lugar en la fila expiró porque la página dejó de actualizarse "
+        "(por ejemplo, la pestaña estuvo en segundo plano). Presiona de nuevo para continuar."
+    )
+
+
+def run_pending_op() -> None:
+    """Ejecuta la operación pesada pendiente; requiere un cupo asignado."""
+    try:
+        op, topic = st.session_state.pending_op
+        if op == "start":
+            st.session_state.topic = topic
+            reset_quiz()
+            st.session_state.questions = draw_questions(topic)
+        elif op == "finish":
+            st.session_state.result = compute_score(
+                st.session_state.questions or [], st.session_state.responses
+            )
+            st.session_state.finished = True
+    finally:
+        st.session_state.pending_op = None
+
+
+def waiting_poll_interval(position: int) -> float:
+    """Intervalo de consulta para `position` con la configuración de la app."""
+    return poll_interval(position, ADMISSION_MAX_CONCURRENT, ADMISSION_POLL_SECONDS)
+
+
+def render_waiting(position: int) -> None:
+    """Pantalla liviana para sesiones en fila.
+
+    Se dibuja sin estilos ni barra lateral; solo `queue_status` se re-ejecuta
+    periódicamente como fragmento, no el script completo. `run_every` queda
+    fijo al crear el fragmento, así que `queue_status` vuelve a dibujar esta
+    pantalla cuando la posición pide otro intervalo.
+    """
+    op, _ = st.session_state.pending_op
+    st.session_state.poll_every = waiting_poll_interval(position)
+    st.title(APP_TITLE)
+    st.info(f"⏳ {WAITING_MESSAGES.get(op, WAITING_MESSAGES['start'])} Esta pantalla se actualiza sola.")
+    st.fragment(queue_status, run_every=st.session_state.poll_every)()
+    st.button("Cancelar", on_click=cancel_pending_op)
+
+
+def queue_status() -> None:
+    """Consulta el turno; al obtener cupo re-ejecuta la app completa."""
+    if st.session_state.pending_op is None:
+        st.rerun()
+    controller = get_admission_controller()
+    position = controller.try_acquire(st.session_state.ticket)
+    if position == EXPIRED:
+        expire_pending_op()
+        st.rerun()
+    if not position or waiting_poll_interval(position) != st.session_state.poll_every:
+        st.rerun()
+    stats = controller.snapshot()
+    st.markdown(f"Tu posición en la fila: **{position}**")
+    st.progress(1 / (1 + position))
+    st.caption(
+        f"En proceso: {stats['active']}/{stats['max_concurrent']} · "
+        f"En espera: {stats['waiting']} · "
+        f"Espera p99: {stats['wait_p99']:.1f} s"
+    )
 
 
 def render_question(q: Dict[str, Any], idx: int) -> Any:
@@ -107,6 +275,34 @@ def main() -> None:
     st.set_page_config(page_title=APP_TITLE, page_icon="🧠", layout="centered")
     init_state()
 
+    controller = get_admission_controller()
+    if controller.report_due(ADMISSION_LOG_SECONDS):
+        logger.info("Carga de admisión: %s", controller.snapshot())
+
+    if st.session_state.pending_op is None:
+        render_app()
+        return
+
+    # Operación pesada pendiente: el cupo cubre la operación y el render
+    # completo que le sigue; sin cupo solo se dibuja la pantalla de espera.
+    ticket = st.session_state.ticket
+    position = controller.try_acquire(ticket)
+    if position == EXPIRED:
+        expire_pending_op()
+        render_app()
+        return
+    if position:
+        render_waiting(position)
+        return
+    try:
+        run_pending_op()
+        render_app()
+    finally:
+        controller.release(ticket)
+
+
+def render_app() -> None:
+    """Dibuja la app completa: estilos, barra lateral y cuestionario."""
     # Estilos mínimos globales
     st.markdown(
         f"""
@@ -137,10 +333,15 @@ def main() -> None:
     )
 
     st.title(APP_TITLE)
+    for warning in CONFIG_WARNINGS:
+        st.warning(warning)
+    if st.session_state.admission_notice:
+        st.warning(st.session_state.admission_notice)
+        st.session_state.admission_notice = None
 
     if st.session_state.data is None:
         try:
-            st.session_state.data = load_questions(QUESTIONS_PATH)
+            st.session_state.data = load_bank(QUESTIONS_PATH)
         except Exception as e:
             st.error(f"Error al cargar preguntas: {e}\nAsegúrate de que 'data/questions.json' existe y tiene formato válido.")
             return
@@ -183,13 +384,15 @@ def main() -> None:
         else:
             st.markdown("- Selecciona un tema y cantidad\n- Navega con Siguiente/Anterior\n- Finaliza para ver tu puntaje")
 
+        if SHOW_LOAD_METRICS:
+            with st.expander("📈 Carga del servidor"):
+                st.json(get_admission_controller().snapshot())
+
     if start:
         if st.session_state.mode == "exam":
-            st.session_state.topic = "Examen"
-            reset_quiz()
+            request_op("start", "Examen")
         elif topic != "(elige)":
-            st.session_state.topic = topic
-            reset_quiz()
+            request_op("start", topic)
         else:
             st.warning("Selecciona un tema para iniciar.")
 
@@ -213,23 +416,15 @@ def main() -> None:
             )
         return
 
-    # Obtener preguntas según el modo
-    if st.session_state.topic == "Examen":
-        questions = get_exam_questions(st.session_state.data)
-    else:
-        questions = get_questions_for_topic(
-            st.session_state.data, 
-            st.session_state.topic,
-            max_questions=st.session_state.questions_count,
-            shuffle=True
-        )
-    
+    # Preguntas sorteadas al iniciar (ver run_pending_op)
+    questions = st.session_state.questions or []
+
     if not questions:
         st.warning("No hay preguntas disponibles.")
         return
 
     if st.session_state.finished:
-        result = compute_score(questions, st.session_state.responses)
+        result = st.session_state.result
 
         # Resumen con métricas
         st.success("🎉 ¡Cuestionario completado!")
@@ -366,6 +561,9 @@ def main() -> None:
             else:
                 st.session_state.responses[idx] = response
 
+            if is_last:
+                request_op("finish")
+
             # Feedback inmediato sobre la respuesta actual
             try:
                 from app.logic import evaluate_question
@@ -383,10 +581,7 @@ def main() -> None:
                     st.error("❌ Respuesta incorrecta")
                     st.caption(f"Correcta: {correct_text}")
 
-            if is_last:
-                st.session_state.finished = True
-            else:
-                st.session_state.current_idx = min(len(questions) - 1, idx + 1)
+            st.session_state.current_idx = min(len(questions) - 1, idx + 1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,220 @@
+"""Pruebas del control de admisión (`app/admission.py`).
+
+Se usa un reloj falso inyectado en el controlador para simular ráfagas de
+inicio de examen de forma determinista y sin esperas reales.
+"""
+
+import math
+import unittest
+
+from app.admission import (
+    EXPIRED,
+    AdmissionController,
+    _percentile,
+    default_ticket_ttl,
+    poll_interval,
+)
+
+
+class FakeClock:
+    """Reloj manual: el tiempo solo avanza cuando la prueba lo indica."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class BurstSimulationTest(unittest.TestCase):
+    """500 estudiantes presionan "Iniciar" en el mismo instante.
+
+    Cada sesión en espera consulta con `poll_interval` y el controlador usa
+    `default_ticket_ttl`, igual que `app/ui.py` con su configuración por
+    defecto (8 cupos, consulta base de 1 s).
+    """
+
+    SESSIONS = 500
+    MAX_CONCURRENT = 8
+    POLL_SECONDS = 1.0
+    SERVICE_TIME = 0.2  # segundos que dura la ejecución pesada
+    STEP = 0.01
+
+    def test_burst_of_simultaneous_starts(self) -> None:
+        clock = FakeClock()
+        controller = AdmissionController(
+            max_concurrent=self.MAX_CONCURRENT,
+            ticket_ttl=default_ticket_ttl(self.POLL_SECONDS),
+            clock=clock,
+        )
+        tickets = [f"s{i:03d}" for i in range(self.SESSIONS)]
+        admission_order = []
+        latencies = []  # de "Iniciar" (t=0) hasta terminar la ejecución pesada
+        running = {}  # ticket -> instante en que termina su ejecución
+        next_poll = {}
+
+        def poll(ticket: str) -> None:
+            position = controller.try_acquire(ticket)
+            self.assertNotEqual(position, EXPIRED)
+            if position == 0:
+                admission_order.append(ticket)
+                running[ticket] = clock.now + self.SERVICE_TIME
+                latencies.append(clock.now + self.SERVICE_TIME)
+                next_poll.pop(ticket, None)
+            else:
+                interval = poll_interval(position, self.MAX_CONCURRENT, self.POLL_SECONDS)
+                next_poll[ticket] = clock.now + interval
+
+        for ticket in tickets:
+            poll(ticket)
+        self.assertEqual(controller.snapshot()["waiting"], self.SESSIONS - self.MAX_CONCURRENT)
+
+        while next_poll or running:
+            clock.advance(self.STEP)
+            for ticket, done_at in list(running.items()):
+                if done_at <= clock.now:
+                    controller.release(ticket)
+                    del running[ticket]
+            # Las sesiones consultan en el orden en que llegaron
+            for ticket in tickets:
+                if ticket in next_poll and next_poll[ticket] <= clock.now:
+                    poll(ticket)
+            self.assertLessEqual(len(running), self.MAX_CONCURRENT)
+
+        stats = controller.snapshot()
+        self.assertLessEqual(stats["peak_active"], self.MAX_CONCURRENT)
+        self.assertEqual(stats["admitted"], self.SESSIONS)
+        self.assertEqual(stats["expired"], 0)
+        self.assertEqual(stats["reclaimed"], 0)
+        self.assertEqual(stats["active"], 0)
+        self.assertEqual(stats["waiting"], 0)
+        self.assertEqual(admission_order, tickets)
+
+        # Cota a partir de capacidad y servicio: cada cupo atiende una sesión
+        # por ciclo, y un ciclo dura lo que tarde más entre el servicio y la
+        # consulta de la cabeza de la fila. Se exigen ceil(N / cupos) ciclos
+        # con un 25 % de margen (sin espera en fila serían 12.6 s).
+        batches = math.ceil(self.SESSIONS / self.MAX_CONCURRENT)
+        head_poll = poll_interval(1, self.MAX_CONCURRENT, self.POLL_SECONDS)
+        bound = batches * max(self.SERVICE_TIME, head_poll) * 1.25
+        latency_p99 = _percentile(sorted(latencies), 99)
+        self.assertLessEqual(latency_p99, bound)
+        self.assertLessEqual(stats["wait_p99"], bound - self.SERVICE_TIME)
+
+
+class AdmissionControllerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.controller = AdmissionController(
+            max_concurrent=1, ticket_ttl=5.0, max_hold=10.0, clock=self.clock
+        )
+
+    def test_rejects_invalid_capacity(self) -> None:
+        with self.assertRaises(ValueError):
+            AdmissionController(max_concurrent=0)
+
+    def test_release_frees_slot_for_next_in_line(self) -> None:
+        self.assertEqual(self.controller.try_acquire("a"), 0)
+        self.assertEqual(self.controller.try_acquire("b"), 1)
+        self.controller.release("a")
+        self.assertEqual(self.controller.try_acquire("b"), 0)
+        self.controller.release("unknown")  # no falla
+
+    def test_acquire_is_idempotent_while_admitted(self) -> None:
+        self.assertEqual(self.controller.try_acquire("a"), 0)
+        self.assertEqual(self.controller.try_acquire("a"), 0)
+        self.assertEqual(self.controller.snapshot()["admitted"], 1)
+
+    def test_cancel_removes_ticket_from_queue(self) -> None:
+        self.controller.try_acquire("a")
+        self.assertEqual(self.controller.try_acquire("b"), 1)
+        self.assertEqual(self.controller.try_acquire("c"), 2)
+        self.controller.cancel("b")
+        self.assertEqual(self.controller.try_acquire("c"), 1)
+        self.assertEqual(self.controller.snapshot()["waiting"], 1)
+
+    def test_waiting_ticket_expires_after_ttl(self) -> None:
+        self.controller.try_acquire("a")
+        self.controller.try_acquire("b")
+        self.controller.try_acquire("c")
+        self.clock.advance(3.0)
+        self.controller.try_acquire("c")  # "c" sigue consultando, "b" no
+        self.clock.advance(3.0)
+        self.assertEqual(self.controller.try_acquire("c"), 1)
+        stats = self.controller.snapshot()
+        self.assertEqual(stats["expired"], 1)
+        self.assertEqual(stats["waiting"], 1)
+
+    def test_expired_ticket_is_reported_once_instead_of_requeued(self) -> None:
+        self.controller.try_acquire("a")
+        self.controller.try_acquire("b")
+        self.clock.advance(6.0)
+        self.assertEqual(self.controller.try_acquire("b"), EXPIRED)
+        self.assertEqual(self.controller.snapshot()["waiting"], 0)
+        # Un nuevo pedido explícito vuelve a encolarse normalmente
+        self.assertEqual(self.controller.try_acquire("b"), 1)
+
+    def test_cancel_clears_expired_marker(self) -> None:
+        self.controller.try_acquire("a")
+        self.controller.try_acquire("b")
+        self.clock.advance(6.0)
+        self.controller.try_acquire("c")  # dispara la expiración de "b"
+        self.controller.cancel("b")
+        self.assertEqual(self.controller.try_acquire("b"), 2)
+
+    def test_report_due_once_per_interval(self) -> None:
+        self.assertTrue(self.controller.report_due(30.0))
+        self.assertFalse(self.controller.report_due(30.0))
+        self.clock.advance(30.0)
+        self.assertTrue(self.controller.report_due(30.0))
+
+    def test_unreleased_slot_is_reclaimed_after_max_hold(self) -> None:
+        self.controller.try_acquire("a")
+        self.assertEqual(self.controller.try_acquire("b"), 1)
+        self.clock.advance(4.0)
+        self.assertEqual(self.controller.try_acquire("b"), 1)
+        self.clock.advance(4.0)
+        self.assertEqual(self.controller.try_acquire("b"), 1)
+        self.clock.advance(4.0)
+        self.assertEqual(self.controller.try_acquire("b"), 0)
+        self.assertEqual(self.controller.snapshot()["reclaimed"], 1)
+
+
+class PollIntervalTest(unittest.TestCase):
+    def test_front_of_queue_polls_fastest(self) -> None:
+        self.assertEqual(poll_interval(1, 8, 1.0), 0.25)
+        self.assertEqual(poll_interval(16, 8, 1.0), 0.25)
+        self.assertEqual(poll_interval(17, 8, 1.0), 0.5)
+        self.assertEqual(poll_interval(32, 8, 1.0), 0.5)
+
+    def test_back_of_queue_backs_off_up_to_limit(self) -> None:
+        self.assertEqual(poll_interval(33, 8, 1.0), 1.0)
+        self.assertEqual(poll_interval(65, 8, 1.0), 2.0)
+        self.assertEqual(poll_interval(500, 8, 1.0), 4.0)
+
+    def test_ticket_ttl_outlasts_slowest_poll(self) -> None:
+        self.assertGreater(default_ticket_ttl(1.0), poll_interval(10_000, 8, 1.0))
+        self.assertGreaterEqual(default_ticket_ttl(1.0), 30.0)
+
+
+class PercentileTest(unittest.TestCase):
+    def test_empty_returns_zero(self) -> None:
+        self.assertEqual(_percentile([], 99), 0.0)
+
+    def test_single_value(self) -> None:
+        self.assertEqual(_percentile([2.5], 50), 2.5)
+        self.assertEqual(_percentile([2.5], 99), 2.5)
+
+    def test_nearest_rank(self) -> None:
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(_percentile(values, 50), 50.0)
+        self.assertEqual(_percentile(values, 99), 99.0)
+        self.assertEqual(_percentile(values, 100), 100.0)
+        self.assertEqual(_percentile([1.0, 2.0, 3.0], 50), 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()